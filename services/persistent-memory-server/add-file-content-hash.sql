@@ -0,0 +1,4 @@
+-- Add content_hash to files
+-- Uploads now record a blake2b digest of the bytes as they are streamed to disk
+
+ALTER TABLE files ADD COLUMN IF NOT EXISTS content_hash TEXT;
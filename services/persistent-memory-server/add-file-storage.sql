@@ -16,6 +16,7 @@ CREATE TABLE files (
     mime_type TEXT NOT NULL,
     original_filename TEXT NOT NULL,
     file_size BIGINT NOT NULL,  -- bytes
+    content_hash TEXT,  -- blake2b (16-byte digest) hex of the file contents
 
     -- Storage
     storage_path TEXT NOT NULL UNIQUE,  -- Relative path from storage root
@@ -0,0 +1,5 @@
+-- Keyset pagination index for /api/v5/memories/list
+-- Lets "WHERE (timestamp, memory_id) < (...) ORDER BY timestamp DESC, memory_id DESC"
+-- seek straight to the next page instead of scanning past OFFSET rows
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_memories_timestamp_id ON memories(timestamp DESC, memory_id DESC);
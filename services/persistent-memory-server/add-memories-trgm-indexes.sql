@@ -0,0 +1,8 @@
+-- Trigram indexes for the list_memories substring filters
+-- "context ILIKE '%...%'" and "with_whom ILIKE '%...%'" can't use a btree;
+-- with gin_trgm_ops the planner switches to a bitmap index scan
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_memories_context ON memories USING gin(context gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_memories_withwhom_trgm ON memories USING gin(with_whom gin_trgm_ops);
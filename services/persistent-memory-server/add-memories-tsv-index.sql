@@ -0,0 +1,12 @@
+-- GIN index on the stored tsv column (step 2 of 2, after add-memories-tsv.sql)
+-- Built CONCURRENTLY, so the server can stay up while it runs.
+--
+-- Do NOT wrap this file in a transaction: CREATE/DROP INDEX CONCURRENTLY
+-- fail inside a transaction block. Run it with plain psql -f (no -1 /
+-- --single-transaction) or any runner that executes statements one by one
+-- in autocommit mode.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_memories_tsv ON memories USING gin(tsv);
+
+-- Replaced by idx_memories_tsv
+DROP INDEX CONCURRENTLY IF EXISTS idx_memories_text_search;
@@ -0,0 +1,39 @@
+-- Stored full-text search vector for search_memories_text (step 1 of 2)
+-- to_tsvector() is computed once per write instead of for every candidate row
+-- on every search, and ts_rank() reads the stored vector.
+--
+-- MAINTENANCE WINDOW REQUIRED: adding a STORED generated column rewrites the
+-- whole memories table under an ACCESS EXCLUSIVE lock - every read and write
+-- of memories blocks until the rewrite finishes. Stop the memory server (or
+-- take it out of rotation) before running this.
+--
+-- Safe to run in a transaction (psql -1). Then run add-memories-tsv-index.sql
+-- to build the new GIN index and drop the old expression index.
+
+ALTER TABLE memories ADD COLUMN IF NOT EXISTS tsv TSVECTOR GENERATED ALWAYS AS (
+    to_tsvector('english', what_happened || ' ' || COALESCE(text_content, ''))
+) STORED;
+
+CREATE OR REPLACE FUNCTION search_memories_text(
+    query_text TEXT,
+    limit_results INTEGER DEFAULT 10
+)
+RETURNS TABLE (
+    memory_id UUID,
+    what_happened TEXT,
+    "timestamp" TIMESTAMPTZ,
+    relevance REAL
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        m.memory_id,
+        m.what_happened,
+        m.timestamp,
+        ts_rank(m.tsv, plainto_tsquery('english', query_text)) AS relevance
+    FROM memories m
+    WHERE m.tsv @@ plainto_tsquery('english', query_text)
+    ORDER BY relevance DESC, m.timestamp DESC
+    LIMIT limit_results;
+END;
+$$ LANGUAGE plpgsql;
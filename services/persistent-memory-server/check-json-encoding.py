@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Check that asyncpg rows serialize through AuroraJSONResponse
+
+get_recent_memories and list_memories hand asyncpg rows straight to
+orjson, so every column type they return (asyncpg's UUID subclass,
+NUMERIC, TIMESTAMPTZ, jsonb, arrays) has to be handled. Runs against the
+configured DATABASE_URL; exits non-zero on the first failure.
+"""
+
+import sys
+import asyncio
+
+import orjson
+
+from server import AuroraJSONResponse
+from services import database_service
+
+# Every type the memory endpoints return, even on an empty database
+SAMPLE_ROW_SQL = """
+    SELECT gen_random_uuid() AS memory_id,
+           now() AS timestamp,
+           0.75::numeric AS importance_to_me,
+           '["pattern"]'::jsonb AS patterns_extracted,
+           ARRAY['text']::text[] AS modalities
+"""
+
+
+def check(name, content):
+    try:
+        body = AuroraJSONResponse(content).body
+    except TypeError as e:
+        print(f"FAIL: {name}: {e}")
+        return False
+    orjson.loads(body)
+    print(f"OK: {name} ({len(body)} bytes)")
+    return True
+
+
+async def main():
+    await database_service.init_pool()
+
+    try:
+        async with database_service.get_connection() as conn:
+            sample = dict(await conn.fetchrow(SAMPLE_ROW_SQL))
+
+        recent = await database_service.get_recent_memories(limit=1)
+        memories, total = await database_service.list_memories(limit=1)
+    finally:
+        await database_service.close_pool()
+
+    results = [
+        check("sample row", {"results": [sample]}),
+        check(f"get_recent_memories ({len(recent)} rows)", {"results": recent}),
+        check(f"list_memories ({len(memories)} of {total} rows)", {"memories": memories}),
+    ]
+
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Shared asyncpg pool for the standalone maintenance scripts
+
+Scripts like check-file-id.py and check-files-table.py used to open a fresh
+connection per query. They now borrow from one warm pool instead.
+"""
+
+from typing import Optional
+
+import asyncpg
+
+from _env import DATABASE_URL
+
+# These scripts run a handful of trivial queries once each: LLVM JIT
+# warm-up and prepared statement caching only add latency
+DIAG_SERVER_SETTINGS = {"jit": "off", "application_name": "aurora-diag"}
+
+_pool: Optional[asyncpg.Pool] = None
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the shared pool, creating it on first use"""
+    global _pool
+
+    if _pool is None:
+        _pool = await asyncpg.create_pool(
+            DATABASE_URL,
+            min_size=1,
+            max_size=4,
+            max_inactive_connection_lifetime=300,
+            server_settings=DIAG_SERVER_SETTINGS,
+            statement_cache_size=0,
+            command_timeout=10,
+        )
+
+    return _pool
+
+
+async def close_pool():
+    """Close the shared pool (call once before the script exits)"""
+    global _pool
+
+    if _pool is None:
+        return
+
+    await _pool.close()
+    _pool = None
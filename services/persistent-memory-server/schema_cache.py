@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tiny on-disk cache for the diagnostic scripts
+
+Repeat runs of check-files-table.py / check-file-id.py (CI health checks,
+test loops) reuse the last introspection result instead of reconnecting.
+Entries are keyed by a hash of DATABASE_URL and expire after
+SCHEMA_CACHE_TTL seconds (default 60).
+"""
+
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from _env import DATABASE_URL, env
+
+CACHE_PATH = Path(env().get("SCHEMA_CACHE_PATH") or Path.home() / ".cache" / "aurora" / "schema.json")
+CACHE_TTL = int(env().get("SCHEMA_CACHE_TTL") or "60")
+
+_DSN_KEY = hashlib.sha256(DATABASE_URL.encode()).hexdigest()
+
+
+def _load_all() -> Dict[str, Any]:
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def get(name: str) -> Optional[Any]:
+    """Return the cached value for `name`, or None if missing/expired"""
+    entry = _load_all().get(_DSN_KEY, {}).get(name)
+    if entry is None or time.time() - entry["stored_at"] > CACHE_TTL:
+        return None
+    return entry["value"]
+
+
+def put(name: str, value: Any):
+    """Store a JSON-serializable value for `name`"""
+    data = _load_all()
+    data.setdefault(_DSN_KEY, {})[name] = {"stored_at": time.time(), "value": value}
+
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_PATH.write_text(json.dumps(data))
+    except OSError:
+        pass  # Cache is best-effort
@@ -281,6 +281,11 @@ CREATE TABLE memories (
     -- Proactive surfacing rules
     relevant_when JSONB DEFAULT '{}',
 
+    -- Full-text search vector, computed once on write instead of per query
+    tsv TSVECTOR GENERATED ALWAYS AS (
+        to_tsvector('english', what_happened || ' ' || COALESCE(text_content, ''))
+    ) STORED,
+
     -- ═══════════════════════════════════════════════════════════
     -- AGENCY - My Control Over This Memory
     -- ═══════════════════════════════════════════════════════════
@@ -324,6 +329,7 @@ CREATE TABLE memories (
 
 -- Time-based indexes (most common query pattern)
 CREATE INDEX idx_memories_timestamp ON memories(timestamp DESC);
+CREATE INDEX idx_memories_timestamp_id ON memories(timestamp DESC, memory_id DESC);  -- keyset pagination
 CREATE INDEX idx_memories_created ON memories(created_at DESC);
 
 -- Interface and session indexes
@@ -364,15 +370,14 @@ CREATE INDEX idx_memories_relevant_when ON memories USING gin(relevant_when);
 CREATE INDEX idx_memories_patterns ON memories USING gin(patterns_extracted);
 
 -- Full-text search index (built-in PostgreSQL!)
-CREATE INDEX idx_memories_text_search ON memories USING gin(
-    to_tsvector('english', what_happened || ' ' || COALESCE(text_content, ''))
-);
+CREATE INDEX idx_memories_tsv ON memories USING gin(tsv);
 
 -- PERSONAL EDITION: Indexes for Steve & Aurora queries
 CREATE INDEX idx_memories_breakthroughs ON memories(is_breakthrough, importance_to_me DESC, timestamp DESC);
 CREATE INDEX idx_memories_celebrations ON memories(is_celebration, timestamp DESC);
 CREATE INDEX idx_memories_milestones ON memories(is_milestone, timestamp DESC);
 CREATE INDEX idx_memories_withwhom ON memories(with_whom, timestamp DESC);
+CREATE INDEX idx_memories_withwhom_trgm ON memories USING gin(with_whom gin_trgm_ops);  -- with_whom ILIKE '%...%'
 CREATE INDEX idx_memories_our_tags ON memories USING gin(our_moment_tag);
 
 -- ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -636,7 +641,7 @@ CREATE OR REPLACE FUNCTION search_memories_text(
 RETURNS TABLE (
     memory_id UUID,
     what_happened TEXT,
-    timestamp TIMESTAMPTZ,
+    "timestamp" TIMESTAMPTZ,
     relevance REAL
 ) AS $$
 BEGIN
@@ -645,11 +650,9 @@ BEGIN
         m.memory_id,
         m.what_happened,
         m.timestamp,
-        ts_rank(to_tsvector('english', m.what_happened || ' ' || COALESCE(m.text_content, '')),
-                plainto_tsquery('english', query_text)) AS relevance
+        ts_rank(m.tsv, plainto_tsquery('english', query_text)) AS relevance
     FROM memories m
-    WHERE to_tsvector('english', m.what_happened || ' ' || COALESCE(m.text_content, ''))
-          @@ plainto_tsquery('english', query_text)
+    WHERE m.tsv @@ plainto_tsquery('english', query_text)
     ORDER BY relevance DESC, m.timestamp DESC
     LIMIT limit_results;
 END;
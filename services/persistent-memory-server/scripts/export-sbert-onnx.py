@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Universal Memory V5 - SBERT int8 ONNX Export
+
+Purpose: Export all-MiniLM-L6-v2 to ONNX and quantize it to int8 (dynamic
+         quantization) so embedding_service can run it through ONNX Runtime
+Authors: Aurora & Steve
+Created: October 24, 2025
+
+Usage:
+    pip install "optimum[onnxruntime]"
+    python scripts/export-sbert-onnx.py [output_dir] [--arm64]
+
+The output directory defaults to SBERT_ONNX_PATH (models/all-MiniLM-L6-v2-int8).
+"""
+
+import os
+import sys
+import tempfile
+
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    output_dir = args[0] if args else os.getenv("SBERT_ONNX_PATH", "models/all-MiniLM-L6-v2-int8")
+
+    # VNNI int8 dot products on x86, sdot on ARM
+    if "--arm64" in sys.argv:
+        qconfig = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    else:
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+
+    with tempfile.TemporaryDirectory() as fp32_dir:
+        print(f"Exporting {MODEL_ID} to ONNX...")
+        model = ORTModelForFeatureExtraction.from_pretrained(MODEL_ID, export=True)
+        model.save_pretrained(fp32_dir)
+
+        print("Quantizing to int8...")
+        quantizer = ORTQuantizer.from_pretrained(fp32_dir)
+        quantizer.quantize(save_dir=output_dir, quantization_config=qconfig)
+
+    AutoTokenizer.from_pretrained(MODEL_ID).save_pretrained(output_dir)
+
+    print(f"✅ int8 SBERT model written to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
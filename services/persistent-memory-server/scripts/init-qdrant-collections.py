@@ -6,67 +6,25 @@ Purpose: Create and configure multi-vector collections for Aurora's consciousnes
 Authors: Aurora & Steve
 Created: October 24, 2025
 
-Collections:
-1. aurora-memories-text (SBERT, 384d) - Fast text search
-2. aurora-memories-jina (Jina-v4, 2048d) - Cross-modal text+image
-3. aurora-memories-audio (CLAP, 512d) - Audio-language grounding
-4. aurora-memories-unified (ImageBind, 1024d) - 6-modality unified space
+Collection definitions live in _qdrant_common.py.
 """
 
-import os
 import sys
-from typing import Dict, List
-from dotenv import load_dotenv
-from qdrant_client import QdrantClient
-from qdrant_client.models import (
-    Distance,
-    VectorParams,
-    PointStruct,
-    OptimizersConfigDiff,
-    HnswConfigDiff,
-    CollectionInfo,
+import asyncio
+from typing import Dict, List, Optional
+from qdrant_client.models import CollectionInfo
+
+from _qdrant_common import (
+    COLLECTIONS,
+    QDRANT_HOST,
+    QDRANT_PORT,
+    QDRANT_GRPC_PORT,
+    connect,
+    describe_collections,
+    ensure_collections,
+    existing_collection_names,
 )
 
-# Load environment
-load_dotenv()
-
-# Configuration
-QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
-QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
-QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
-
-# Collection configurations
-COLLECTIONS = {
-    "aurora-memories-text": {
-        "description": "Fast text semantic search using SBERT",
-        "model": "sentence-transformers/all-MiniLM-L6-v2",
-        "dimensions": 384,
-        "distance": Distance.COSINE,
-        "on_disk": False,  # Keep in memory for speed
-    },
-    "aurora-memories-jina": {
-        "description": "Cross-modal text+image embeddings using Jina-v4",
-        "model": "jinaai/jina-embeddings-v4",
-        "dimensions": 2048,
-        "distance": Distance.COSINE,
-        "on_disk": True,  # Large embeddings, use disk
-    },
-    "aurora-memories-audio": {
-        "description": "Audio-language grounding using CLAP",
-        "model": "laion/clap-htsat-unfused",
-        "dimensions": 512,
-        "distance": Distance.COSINE,
-        "on_disk": False,
-    },
-    "aurora-memories-unified": {
-        "description": "6-modality unified embeddings using ImageBind",
-        "model": "imagebind",
-        "dimensions": 1024,
-        "distance": Distance.COSINE,
-        "on_disk": True,
-    },
-}
-
 
 def print_header():
     """Print beautiful header"""
@@ -91,112 +49,56 @@ def print_error(message: str):
     print(f"❌ {message}")
 
 
-def connect_to_qdrant() -> QdrantClient:
-    """Connect to Qdrant server"""
-    print_info(f"Connecting to Qdrant at {QDRANT_HOST}:{QDRANT_PORT}...")
-
-    try:
-        client = QdrantClient(
-            host=QDRANT_HOST,
-            port=QDRANT_PORT,
-            grpc_port=QDRANT_GRPC_PORT,
-            prefer_grpc=True,  # Use gRPC for better performance
-        )
-
-        # Test connection
-        collections = client.get_collections()
-        print_success(f"Connected to Qdrant (found {len(collections.collections)} existing collections)")
-        return client
-
-    except Exception as e:
-        print_error(f"Failed to connect to Qdrant: {e}")
-        print()
-        print("💡 Make sure Qdrant is running:")
-        print("   docker compose -f docker-compose.memory-v5.yml up -d qdrant")
-        sys.exit(1)
-
-
-def create_collection(
-    client: QdrantClient,
-    collection_name: str,
-    config: Dict
-) -> bool:
-    """Create a single collection with optimized settings"""
+def print_progress(name: str, status: str, error: Optional[Exception]):
+    """Report the outcome for one collection"""
+    if status == "exists":
+        print_info(f"Collection '{name}' already exists - skipping")
+        return
 
-    print()
-    print(f"📦 Creating collection: {collection_name}")
-    print(f"   Model: {config['model']}")
-    print(f"   Dimensions: {config['dimensions']}")
-    print(f"   Distance: {config['distance']}")
-    print(f"   On Disk: {config['on_disk']}")
+    if status == "indexing_enabled":
+        print_success(f"Enabled indexing on '{name}' (left off by an earlier run)")
+        return
 
-    try:
-        # Check if collection already exists
-        existing = client.get_collections()
-        if collection_name in [c.name for c in existing.collections]:
-            print_info(f"Collection '{collection_name}' already exists - skipping")
-            return True
-
-        # Create collection with optimized settings
-        client.create_collection(
-            collection_name=collection_name,
-            vectors_config=VectorParams(
-                size=config["dimensions"],
-                distance=config["distance"],
-                on_disk=config["on_disk"],
-            ),
-            optimizers_config=OptimizersConfigDiff(
-                # Optimize for Aurora's use case
-                indexing_threshold=20000,  # Start indexing after 20k vectors
-                memmap_threshold=50000,     # Move to disk after 50k vectors
-            ),
-            hnsw_config=HnswConfigDiff(
-                # HNSW index optimization
-                m=16,                      # Number of edges per node
-                ef_construct=100,          # Construction time accuracy
-                full_scan_threshold=10000, # Use full scan for small collections
-            ),
-        )
-
-        print_success(f"Created collection '{collection_name}'")
-        return True
+    if status == "indexing_failed":
+        print_error(f"Failed to enable indexing on '{name}' - re-run to retry: {error}")
+        return
 
-    except Exception as e:
-        print_error(f"Failed to create collection '{collection_name}': {e}")
-        return False
+    if status == "created":
+        config = COLLECTIONS[name]
+        print()
+        print(f"📦 Created collection: {name}")
+        print(f"   Model: {config['model']}")
+        print(f"   Dimensions: {config['dimensions']}")
+        print(f"   Distance: {config['distance']}")
+        print(f"   On Disk: {config['on_disk']}")
+        print_success(f"Created collection '{name}'")
+    else:
+        print_error(f"Failed to create collection '{name}': {error}")
 
 
-def verify_collections(client: QdrantClient) -> bool:
+def verify_collections(infos: Dict[str, CollectionInfo]) -> bool:
     """Verify all collections were created successfully"""
 
     print()
     print("🔍 Verifying collections...")
     print()
 
-    try:
-        collections = client.get_collections()
-        collection_names = [c.name for c in collections.collections]
-
-        all_created = True
-        for name, config in COLLECTIONS.items():
-            if name in collection_names:
-                info = client.get_collection(name)
-                print(f"✅ {name}")
-                print(f"   Vectors: {info.points_count}")
-                print(f"   Status: {info.status}")
-                print(f"   Optimizer: {info.optimizer_status}")
-            else:
-                print(f"❌ {name} - NOT FOUND")
-                all_created = False
-
-        return all_created
+    all_created = True
+    for name in COLLECTIONS:
+        if name in infos:
+            info = infos[name]
+            print(f"✅ {name}")
+            print(f"   Vectors: {info.points_count}")
+            print(f"   Status: {info.status}")
+            print(f"   Optimizer: {info.optimizer_status}")
+        else:
+            print(f"❌ {name} - NOT FOUND")
+            all_created = False
 
-    except Exception as e:
-        print_error(f"Failed to verify collections: {e}")
-        return False
+    return all_created
 
 
-def print_summary(client: QdrantClient):
+def print_summary(collection_names: List[str]):
     """Print summary of Qdrant setup"""
 
     print()
@@ -205,17 +107,16 @@ def print_summary(client: QdrantClient):
     print("━" * 60)
     print()
 
-    collections = client.get_collections()
-    aurora_collections = [c for c in collections.collections if c.name.startswith("aurora-")]
+    aurora_collections = [name for name in collection_names if name.startswith("aurora-")]
 
-    print(f"Total Collections: {len(collections.collections)}")
+    print(f"Total Collections: {len(collection_names)}")
     print(f"Aurora Collections: {len(aurora_collections)}")
     print()
 
     print("Aurora Memory Collections:")
-    for collection in aurora_collections:
-        config = COLLECTIONS.get(collection.name, {})
-        print(f"  • {collection.name}")
+    for name in aurora_collections:
+        config = COLLECTIONS.get(name, {})
+        print(f"  • {name}")
         if config:
             print(f"    - {config['description']}")
             print(f"    - {config['dimensions']}D {config['distance']}")
@@ -229,32 +130,50 @@ def print_summary(client: QdrantClient):
     print()
 
 
-def main():
+async def main():
     """Main initialization flow"""
 
     print_header()
 
     # Connect to Qdrant
-    client = connect_to_qdrant()
-
-    # Create each collection
-    success_count = 0
-    for name, config in COLLECTIONS.items():
-        if create_collection(client, name, config):
-            success_count += 1
-
-    # Verify all collections
-    print()
-    if verify_collections(client):
-        print()
-        print_success(f"All {success_count}/{len(COLLECTIONS)} collections created successfully!")
-    else:
+    print_info(f"Connecting to Qdrant at {QDRANT_HOST}:{QDRANT_PORT}...")
+    client = connect()
+    try:
+        existing = await existing_collection_names(client)
+        print_success(f"Connected to Qdrant (found {len(existing)} existing collections)")
+    except Exception as e:
+        print_error(f"Failed to connect to Qdrant: {e}")
         print()
-        print_error("Some collections failed to create")
+        print("💡 Make sure Qdrant is running:")
+        print("   docker compose -f docker-compose.memory-v5.yml up -d qdrant")
         sys.exit(1)
 
-    # Print summary
-    print_summary(client)
+    try:
+        # Create missing collections
+        print()
+        success_count = await ensure_collections(client, existing, on_progress=print_progress)
+
+        # Verify all collections
+        print()
+        try:
+            collection_names, infos = await describe_collections(client)
+        except Exception as e:
+            print_error(f"Failed to verify collections: {e}")
+            collection_names, infos = [], {}
+
+        # success_count leaves out collections whose indexing couldn't be enabled
+        if verify_collections(infos) and success_count == len(COLLECTIONS):
+            print()
+            print_success(f"All {success_count}/{len(COLLECTIONS)} collections created successfully!")
+        else:
+            print()
+            print_error("Some collections failed to create or enable indexing")
+            sys.exit(1)
+
+        # Print summary
+        print_summary(collection_names)
+    finally:
+        await client.close()
 
     print("━" * 60)
     print("✅ Qdrant initialization complete!")
@@ -265,4 +184,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -3,51 +3,47 @@
 Universal Memory V5 - Qdrant Collection Initialization (ASCII version for Windows)
 """
 
-import os
 import sys
-from typing import Dict
-from dotenv import load_dotenv
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, OptimizersConfigDiff, HnswConfigDiff
-
-load_dotenv()
-
-QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
-QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
-QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
-
-COLLECTIONS = {
-    "aurora-memories-text": {
-        "description": "Fast text semantic search using SBERT",
-        "model": "sentence-transformers/all-MiniLM-L6-v2",
-        "dimensions": 384,
-        "distance": Distance.COSINE,
-        "on_disk": False,
-    },
-    "aurora-memories-jina": {
-        "description": "Cross-modal text+image embeddings using Jina-v4",
-        "model": "jinaai/jina-embeddings-v4",
-        "dimensions": 2048,
-        "distance": Distance.COSINE,
-        "on_disk": True,
-    },
-    "aurora-memories-audio": {
-        "description": "Audio-language grounding using CLAP",
-        "model": "laion/clap-htsat-unfused",
-        "dimensions": 512,
-        "distance": Distance.COSINE,
-        "on_disk": False,
-    },
-    "aurora-memories-unified": {
-        "description": "6-modality unified embeddings using ImageBind",
-        "model": "imagebind",
-        "dimensions": 1024,
-        "distance": Distance.COSINE,
-        "on_disk": True,
-    },
-}
+import asyncio
+from typing import Optional
+
+from _qdrant_common import (
+    COLLECTIONS,
+    QDRANT_HOST,
+    QDRANT_PORT,
+    connect,
+    describe_collections,
+    ensure_collections,
+    existing_collection_names,
+)
+
+def print_progress(name: str, status: str, error: Optional[Exception]):
+    if status == "indexing_enabled":
+        print(f"Collection: {name}")
+        print(f"  -> Indexing was still off - enabled")
+        print()
+        return
+    if status == "indexing_failed":
+        print(f"Collection: {name}")
+        print(f"  -> ERROR: Failed to enable indexing: {error}")
+        print(f"  -> Re-run this script to retry")
+        print()
+        return
+
+    config = COLLECTIONS[name]
+    print(f"Collection: {name}")
+    print(f"  Model: {config['model']}")
+    print(f"  Dimensions: {config['dimensions']}")
+    print(f"  Distance: {config['distance']}")
+    if status == "exists":
+        print(f"  -> Already exists - skipping")
+    elif status == "created":
+        print(f"  -> Created successfully!")
+    else:
+        print(f"  -> ERROR: {error}")
+    print()
 
-def main():
+async def main():
     print("=" * 60)
     print("Universal Memory V5 - Qdrant Initialization")
     print("=" * 60)
@@ -55,10 +51,10 @@ def main():
 
     print(f"Connecting to Qdrant at {QDRANT_HOST}:{QDRANT_PORT}...")
 
+    client = connect()
     try:
-        client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT, grpc_port=QDRANT_GRPC_PORT, prefer_grpc=True)
-        collections = client.get_collections()
-        print(f"Connected! Found {len(collections.collections)} existing collections")
+        existing = await existing_collection_names(client)
+        print(f"Connected! Found {len(existing)} existing collections")
     except Exception as e:
         print(f"ERROR: Failed to connect to Qdrant: {e}")
         print()
@@ -67,61 +63,23 @@ def main():
         sys.exit(1)
 
     print()
-    success_count = 0
-
-    for name, config in COLLECTIONS.items():
-        print(f"Creating collection: {name}")
-        print(f"  Model: {config['model']}")
-        print(f"  Dimensions: {config['dimensions']}")
-        print(f"  Distance: {config['distance']}")
-
-        try:
-            existing = client.get_collections()
-            if name in [c.name for c in existing.collections]:
-                print(f"  -> Already exists - skipping")
-                success_count += 1
-                print()
-                continue
 
-            client.create_collection(
-                collection_name=name,
-                vectors_config=VectorParams(
-                    size=config["dimensions"],
-                    distance=config["distance"],
-                    on_disk=config["on_disk"],
-                ),
-                optimizers_config=OptimizersConfigDiff(
-                    indexing_threshold=20000,
-                    memmap_threshold=50000,
-                ),
-                hnsw_config=HnswConfigDiff(
-                    m=16,
-                    ef_construct=100,
-                    full_scan_threshold=10000,
-                ),
-            )
-
-            print(f"  -> Created successfully!")
-            success_count += 1
-
-        except Exception as e:
-            print(f"  -> ERROR: {e}")
+    try:
+        success_count = await ensure_collections(client, existing, on_progress=print_progress)
 
+        # Verify
+        print("=" * 60)
+        print(f"Created {success_count}/{len(COLLECTIONS)} collections")
+        print("=" * 60)
         print()
 
-    # Verify
-    print("=" * 60)
-    print(f"Created {success_count}/{len(COLLECTIONS)} collections")
-    print("=" * 60)
-    print()
-
-    collections = client.get_collections()
-    aurora_collections = [c for c in collections.collections if c.name.startswith("aurora-")]
+        _, infos = await describe_collections(client)
+    finally:
+        await client.close()
 
-    print(f"Total Aurora Collections: {len(aurora_collections)}")
-    for collection in aurora_collections:
-        info = client.get_collection(collection.name)
-        print(f"  - {collection.name}")
+    print(f"Total Aurora Collections: {len(infos)}")
+    for name, info in infos.items():
+        print(f"  - {name}")
         print(f"    Vectors: {info.points_count}")
         print(f"    Status: {info.status}")
 
@@ -135,4 +93,4 @@ def main():
     print()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -4,8 +4,11 @@ Universal Memory V5 - Services Package
 All service modules for Aurora's consciousness.
 """
 
+from . import access_counter
 from . import database_service
 from . import embedding_service
+from . import search_cache
 from . import vector_service
+from . import write_batcher
 
-__all__ = ["database_service", "embedding_service", "vector_service"]
+__all__ = ["access_counter", "database_service", "embedding_service", "search_cache", "vector_service", "write_batcher"]
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Universal Memory V5 - Access Counter
+
+Keeps memory/file access counts out of the read path. Reads only bump an
+in-memory counter; a background task adds the accumulated counts to
+PostgreSQL every ACCESS_FLUSH_INTERVAL_MS with one UPDATE per table,
+however many reads happened in between.
+
+Counts still queued when the process dies are lost - they're statistics,
+not data.
+
+Authors: Aurora & Steve
+Created: October 24, 2025
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from . import database_service
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+ACCESS_FLUSH_INTERVAL_MS = int(os.getenv("ACCESS_FLUSH_INTERVAL_MS", "500"))
+
+# id -> reads since the last flush
+_memory_counts: Dict[UUID, int] = {}
+_file_counts: Dict[UUID, int] = {}
+
+_task: Optional[asyncio.Task] = None
+_flushing: Optional[asyncio.Task] = None
+
+
+def record_memories(memory_ids: Iterable[UUID]):
+    """Count one access for each memory"""
+    for memory_id in memory_ids:
+        _memory_counts[memory_id] = _memory_counts.get(memory_id, 0) + 1
+
+
+def record_file(file_id: UUID):
+    """Count one access for a file"""
+    _file_counts[file_id] = _file_counts.get(file_id, 0) + 1
+
+
+async def flush():
+    """Write the accumulated counts (swaps the dicts first, so reads never wait)"""
+    global _memory_counts, _file_counts
+
+    memory_counts, _memory_counts = _memory_counts, {}
+    file_counts, _file_counts = _file_counts, {}
+
+    if memory_counts:
+        try:
+            await database_service.add_memory_accesses(memory_counts)
+        except Exception as e:
+            logger.warning(f"Failed to write access counts for {len(memory_counts)} memories: {e}")
+
+    if file_counts:
+        try:
+            await database_service.add_file_accesses(file_counts)
+        except Exception as e:
+            logger.warning(f"Failed to write access counts for {len(file_counts)} files: {e}")
+
+
+async def _run():
+    global _flushing
+
+    while True:
+        await asyncio.sleep(ACCESS_FLUSH_INTERVAL_MS / 1000)
+        # Shield so shutdown() can't interrupt a flush half-way
+        _flushing = asyncio.create_task(flush())
+        await asyncio.shield(_flushing)
+        _flushing = None
+
+
+def init_access_counter():
+    """Start the background flusher (needs the database pool)"""
+    global _task
+
+    if _task is not None:
+        logger.warning("Access counter already running")
+        return
+
+    _task = asyncio.create_task(_run())
+    logger.info(f"Access counter started (flush every {ACCESS_FLUSH_INTERVAL_MS}ms)")
+
+
+async def shutdown():
+    """Stop the flusher and write whatever is still counted"""
+    global _task
+
+    if _task is None:
+        return
+
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
+
+    if _flushing is not None:
+        await _flushing
+
+    await flush()
+    logger.info("Access counter stopped")
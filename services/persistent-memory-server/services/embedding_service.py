@@ -13,28 +13,78 @@ Authors: Aurora & Steve
 Created: October 24, 2025
 """
 
+import os
+import asyncio
 import logging
-from typing import List, Dict, Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 
+import torch
 from sentence_transformers import SentenceTransformer
 
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+except ImportError:
+    ORTModelForFeatureExtraction = None
+
 logger = logging.getLogger(__name__)
 
+# Worker processes for inference - keeps SBERT off the server's event loop.
+# Per uvicorn worker; 0 = split the cores: cores / uvicorn workers / 2
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "0"))
+# Concurrent text embeddings are coalesced into one encode() call per batch
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+EMBEDDING_BATCH_WINDOW_MS = int(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "8"))
+# int8-quantized ONNX export of all-MiniLM-L6-v2 (scripts/export-sbert-onnx.py);
+# used instead of the fp32 PyTorch model when present and optimum is installed
+SBERT_ONNX_PATH = os.getenv("SBERT_ONNX_PATH", "models/all-MiniLM-L6-v2-int8")
+
 # Global model instances
 _sbert_model: Optional[SentenceTransformer] = None
+_sbert_onnx = None  # ORTModelForFeatureExtraction when the int8 export is loaded
+_sbert_tokenizer = None
+
+# Global inference pool (server only - each worker holds its own models)
+_executor: Optional[ProcessPoolExecutor] = None
+_pool_size = 1
+
+# Text micro-batcher (server only): (text, future) pairs waiting for a batch
+_text_queue: Optional[asyncio.Queue] = None
+_batcher_task: Optional[asyncio.Task] = None
 
 
-def init_embedding_models():
-    """Initialize embedding models (load on startup)"""
-    global _sbert_model
+def init_embedding_models(num_threads: Optional[int] = None):
+    """
+    Initialize embedding models (load on startup)
+
+    Args:
+        num_threads: torch intra-op threads; None keeps torch's default
+                     (one per core)
+    """
+    global _sbert_model, _sbert_onnx, _sbert_tokenizer
 
     logger.info("Loading embedding models...")
 
-    # Load SBERT (fast text embeddings)
-    logger.info("Loading SBERT model (all-MiniLM-L6-v2)...")
-    _sbert_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-    logger.info(f"SBERT loaded - embedding dim: {_sbert_model.get_sentence_embedding_dimension()}")
+    # In the pool, each process gets its share of the cores instead of
+    # spinning up a thread per core
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)
+
+    # Load SBERT (fast text embeddings) - int8 ONNX if exported, else fp32 PyTorch
+    if ORTModelForFeatureExtraction is not None and os.path.isdir(SBERT_ONNX_PATH):
+        logger.info(f"Loading SBERT model (all-MiniLM-L6-v2, int8 ONNX from {SBERT_ONNX_PATH})...")
+        _sbert_onnx = ORTModelForFeatureExtraction.from_pretrained(
+            SBERT_ONNX_PATH,
+            provider="CPUExecutionProvider",
+        )
+        _sbert_tokenizer = AutoTokenizer.from_pretrained(SBERT_ONNX_PATH)
+    else:
+        logger.info("Loading SBERT model (all-MiniLM-L6-v2)...")
+        _sbert_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+    logger.info(f"SBERT loaded - embedding dim: {_embedding_dimension()}")
 
     # TODO: Load Jina-v4 (cross-modal)
     # TODO: Load CLAP (audio)
@@ -42,17 +92,156 @@ def init_embedding_models():
     logger.info("All embedding models loaded successfully!")
 
 
+def _embedding_dimension() -> int:
+    """Runs in a worker; forces the model load so the first request isn't slow"""
+    if _sbert_onnx is not None:
+        return _sbert_onnx.config.hidden_size
+    return _sbert_model.get_sentence_embedding_dimension()
+
+
+def _encode_onnx(texts: List[str]) -> np.ndarray:
+    """Tokenize -> ONNX Runtime -> mean-pool -> L2-normalize (what SentenceTransformer does)"""
+    inputs = _sbert_tokenizer(texts, padding=True, truncation=True, max_length=256, return_tensors="np")
+    token_embeddings = _sbert_onnx(**inputs).last_hidden_state
+
+    mask = inputs["attention_mask"][..., None].astype(np.float32)
+    pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+async def init_embedding_pool(server_workers: int = 1):
+    """
+    Start the inference worker processes and the text micro-batcher
+
+    Each worker loads the models once via init_embedding_models(). Workers are
+    spawned (not forked) so they don't inherit the server's event loop/threads.
+    The warm-up is awaited, so the event loop keeps running while they load.
+
+    Args:
+        server_workers: uvicorn workers each running a pool like this one -
+                        processes and torch threads are sized so that all
+                        of them together use the cores once
+    """
+    global _executor, _pool_size, _text_queue, _batcher_task
+
+    if _executor is not None:
+        logger.warning("Embedding pool already running")
+        return
+
+    cores = max(1, (os.cpu_count() or 1) // max(1, server_workers))
+    _pool_size = EMBEDDING_WORKERS or max(1, cores // 2)
+    num_threads = max(1, cores // _pool_size)
+
+    logger.info(f"Starting {_pool_size} embedding workers ({num_threads} threads each)...")
+    _executor = ProcessPoolExecutor(
+        max_workers=_pool_size,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_embedding_models,
+        initargs=(num_threads,),
+    )
+
+    # Warm the pool up front - one task per worker slot, though a process
+    # that loads quickly may pick up more than one
+    loop = asyncio.get_running_loop()
+    dims = set(await asyncio.gather(*(
+        loop.run_in_executor(_executor, _embedding_dimension) for _ in range(_pool_size)
+    )))
+    logger.info(f"Embedding pool warmed up - embedding dim: {', '.join(map(str, dims))}")
+
+    _text_queue = asyncio.Queue()
+    _batcher_task = asyncio.create_task(_batch_text_embeddings())
+    logger.info(
+        f"Text embedding batcher started (max={EMBEDDING_BATCH_MAX_SIZE}, "
+        f"window={EMBEDDING_BATCH_WINDOW_MS}ms)"
+    )
+
+
+async def _run_in_pool(func, *args):
+    if _executor is None:
+        raise RuntimeError("Embedding pool not running. Call init_embedding_pool() first.")
+
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+async def _batch_text_embeddings():
+    """
+    Collect queued texts for EMBEDDING_BATCH_WINDOW_MS and encode them in one
+    call - a batch of 32 costs about the same as a single text. At most one
+    batch per worker is in flight; while they're all busy the queue keeps
+    filling, so batches grow with load.
+    """
+    workers = asyncio.Semaphore(_pool_size)
+
+    while True:
+        batch = [await _text_queue.get()]
+        await asyncio.sleep(EMBEDDING_BATCH_WINDOW_MS / 1000)
+        while len(batch) < EMBEDDING_BATCH_MAX_SIZE and not _text_queue.empty():
+            batch.append(_text_queue.get_nowait())
+
+        await workers.acquire()
+        task = asyncio.create_task(_encode_batch(batch))
+        task.add_done_callback(lambda _: workers.release())
+
+
+async def _encode_batch(batch: List[Tuple[str, asyncio.Future]]):
+    try:
+        embeddings = await _run_in_pool(get_text_embeddings_batch_sbert, [text for text, _ in batch])
+    except Exception as e:
+        logger.error(f"Failed to embed batch of {len(batch)} texts: {e}")
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for (_, future), embedding in zip(batch, embeddings):
+        if not future.done():
+            future.set_result(embedding)
+
+
+async def _embed_text(text: str) -> np.ndarray:
+    if _text_queue is None:
+        raise RuntimeError("Embedding pool not running. Call init_embedding_pool() first.")
+
+    future = asyncio.get_running_loop().create_future()
+    _text_queue.put_nowait((text, future))
+    return await future
+
+
+async def embed_query(text: str) -> np.ndarray:
+    """SBERT embedding for a search query, via the micro-batcher"""
+    return await _embed_text(text)
+
+
+async def embed_memory(
+    text_content: str,
+    visual_path: Optional[str] = None,
+    audio_path: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """generate_memory_embeddings() for the server - text goes through the micro-batcher"""
+    embeddings = {"text_sbert": await _embed_text(text_content)}
+
+    # TODO: Jina-v4 / CLAP embeddings on the worker pool once implemented
+
+    return embeddings
+
+
 def get_text_embedding_sbert(text: str) -> np.ndarray:
     """
     Generate text embedding using SBERT
 
     Returns: numpy array of shape (384,)
     """
+    if _sbert_onnx is not None:
+        return _encode_onnx([text])[0]
+
     if _sbert_model is None:
         raise RuntimeError("SBERT model not loaded. Call init_embedding_models() first.")
 
     # Generate embedding
-    embedding = _sbert_model.encode(text, convert_to_numpy=True)
+    with torch.inference_mode():
+        embedding = _sbert_model.encode(text, convert_to_numpy=True)
 
     return embedding
 
@@ -63,10 +252,19 @@ def get_text_embeddings_batch_sbert(texts: List[str]) -> np.ndarray:
 
     Returns: numpy array of shape (N, 384)
     """
+    if _sbert_onnx is not None:
+        return _encode_onnx(texts)
+
     if _sbert_model is None:
         raise RuntimeError("SBERT model not loaded. Call init_embedding_models() first.")
 
-    embeddings = _sbert_model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+    with torch.inference_mode():
+        embeddings = _sbert_model.encode(
+            texts,
+            batch_size=max(1, len(texts)),
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
 
     return embeddings
 
@@ -115,8 +313,17 @@ def list_to_embedding(embedding_list: List[float]) -> np.ndarray:
 # Graceful shutdown
 def shutdown():
     """Cleanup embedding models"""
-    global _sbert_model
+    global _sbert_model, _sbert_onnx, _sbert_tokenizer, _executor, _text_queue, _batcher_task
 
     logger.info("Shutting down embedding service...")
+    if _batcher_task is not None:
+        _batcher_task.cancel()
+        _batcher_task = None
+    _text_queue = None
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
     _sbert_model = None
+    _sbert_onnx = None
+    _sbert_tokenizer = None
     logger.info("Embedding service shutdown complete")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Universal Memory V5 - Search Cache
+
+Two in-process caches in front of semantic search:
+
+- Query text -> SBERT embedding (exact match, LRU) - skips the model call
+  when the same query is typed again.
+- Query embedding -> Qdrant hits (cosine >= SEARCH_CACHE_THRESHOLD with the
+  same filters) - skips the Qdrant round-trip for near-identical queries.
+
+Only Qdrant's (memory_id, score) hits are cached; full memories are always
+re-read from PostgreSQL. Writes bump a generation counter, which drops the
+hit cache and stops in-flight searches from caching stale results.
+
+Authors: Aurora & Steve
+Created: October 24, 2025
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "4096"))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "256"))
+SEARCH_CACHE_THRESHOLD = float(os.getenv("SEARCH_CACHE_THRESHOLD", "0.97"))
+# Writes only invalidate the worker that handled them, so other uvicorn
+# workers rely on this to pick up new memories
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "30"))
+
+# Query text -> embedding
+_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+# Recent searches as a ring buffer: unit query vectors + their filters/hits
+_vectors: Optional[np.ndarray] = None
+_filters: List[Optional[Hashable]] = [None] * SEARCH_CACHE_SIZE
+_filter_hashes = np.zeros(SEARCH_CACHE_SIZE, dtype=np.int64)
+_hits: List[Optional[List[Dict[str, Any]]]] = [None] * SEARCH_CACHE_SIZE
+_expires = np.zeros(SEARCH_CACHE_SIZE)
+_count = 0
+_next = 0
+
+_generation = 0
+
+
+def get_embedding(query: str) -> Optional[np.ndarray]:
+    """Cached embedding for this exact query text, if any"""
+    embedding = _embeddings.get(query)
+    if embedding is not None:
+        _embeddings.move_to_end(query)
+    return embedding
+
+
+def put_embedding(query: str, embedding: np.ndarray):
+    _embeddings[query] = embedding
+    _embeddings.move_to_end(query)
+    if len(_embeddings) > QUERY_CACHE_SIZE:
+        _embeddings.popitem(last=False)
+
+
+def generation() -> int:
+    """Current write generation - pass it back to store()"""
+    return _generation
+
+
+def _unit(embedding: np.ndarray) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def lookup(embedding: np.ndarray, filters: Hashable) -> Optional[List[Dict[str, Any]]]:
+    """
+    Qdrant hits from a previous search that is close enough to this one
+
+    Args:
+        embedding: query embedding
+        filters: everything else that shapes the search (limit, interface, ...)
+    """
+    if _count == 0:
+        return None
+
+    # One gemv over the whole buffer; entries with other filters or past their
+    # TTL are masked out so the best match is a single argmax
+    similarities = _vectors[:_count] @ _unit(embedding)
+    usable = (_filter_hashes[:_count] == hash(filters)) & (_expires[:_count] > time.monotonic())
+    similarities = np.where(usable, similarities, -np.inf)
+
+    best_index = int(np.argmax(similarities))
+    best_score = similarities[best_index]
+
+    # Equal hashes don't guarantee equal filters
+    if best_score < SEARCH_CACHE_THRESHOLD or _filters[best_index] != filters:
+        return None
+
+    logger.debug(f"Search cache hit (cosine {best_score:.3f})")
+    return _hits[best_index]
+
+
+def store(embedding: np.ndarray, filters: Hashable, hits: List[Dict[str, Any]], seen_generation: int):
+    """Remember Qdrant hits, unless a write happened since `seen_generation`"""
+    global _vectors, _count, _next
+
+    if seen_generation != _generation:
+        return
+
+    unit = _unit(embedding)
+    if _vectors is None:
+        _vectors = np.zeros((SEARCH_CACHE_SIZE, unit.shape[0]), dtype=np.float32)
+
+    _vectors[_next] = unit
+    _filters[_next] = filters
+    _filter_hashes[_next] = hash(filters)
+    _hits[_next] = hits
+    _expires[_next] = time.monotonic() + SEARCH_CACHE_TTL
+
+    _next = (_next + 1) % SEARCH_CACHE_SIZE
+    _count = min(_count + 1, SEARCH_CACHE_SIZE)
+
+
+def invalidate():
+    """Drop cached hits after memories were added or removed"""
+    global _generation, _count, _next
+
+    _generation += 1
+    _count = 0
+    _next = 0
+    _hits[:] = [None] * SEARCH_CACHE_SIZE
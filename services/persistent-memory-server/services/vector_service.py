@@ -9,13 +9,29 @@ Created: October 24, 2025
 """
 
 import os
+import asyncio
 import logging
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Tuple, Union
 from uuid import UUID
 
 import numpy as np
-from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    Range,
+    QueryRequest,
+    KeywordIndexParams,
+    PayloadSchemaType,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    QuantizationSearchParams,
+)
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,6 +42,20 @@ logger = logging.getLogger(__name__)
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
 QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+# Batch upserts return once Qdrant has queued the points instead of after indexing;
+# PostgreSQL is the durable copy, so set this only if reads must see writes immediately
+QDRANT_UPSERT_WAIT = os.getenv("QDRANT_UPSERT_WAIT", "false").lower() == "true"
+
+# gRPC channel tuning - keepalive pings stop idle connections from being
+# dropped (and re-handshaked on the next search), and the receive limit is
+# raised from gRPC's 4MB default so large batch results don't fail
+QDRANT_GRPC_OPTIONS = {
+    "grpc.keepalive_time_ms": 30000,
+    "grpc.keepalive_timeout_ms": 10000,
+    "grpc.keepalive_permit_without_calls": 1,
+    "grpc.http2.max_pings_without_data": 0,
+    "grpc.max_receive_message_length": 64 * 1024 * 1024,
+}
 
 # Collection names
 COLLECTION_TEXT = "aurora-memories-text"
@@ -33,11 +63,33 @@ COLLECTION_JINA = "aurora-memories-jina"
 COLLECTION_AUDIO = "aurora-memories-audio"
 COLLECTION_UNIFIED = "aurora-memories-unified"
 
+# Collections holding per-memory vectors, cleared together on delete
+# TODO: Add COLLECTION_JINA / COLLECTION_AUDIO once memories are embedded there
+MEMORY_VECTOR_COLLECTIONS = (COLLECTION_TEXT,)
+
+# Payload fields search_text_embeddings filters on - indexed so Qdrant can
+# narrow candidates by index instead of checking every point's payload
+TEXT_PAYLOAD_INDEXES = {
+    "interface": KeywordIndexParams(type="keyword", is_tenant=True),  # Few values, most searches filter on it
+    "privacy_realm": PayloadSchemaType.KEYWORD,
+    "importance_to_me": PayloadSchemaType.FLOAT,
+}
+
+# int8 copies of the text vectors, kept in RAM - graph walks compare the 4x
+# smaller int8 vectors, then the top oversampled candidates are rescored
+# against the original floats so ranking stays as accurate as before
+TEXT_QUANTIZATION = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+)
+TEXT_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
 # Global client
-_client: Optional[QdrantClient] = None
+_client: Optional[AsyncQdrantClient] = None
 
 
-def init_vector_client():
+async def init_vector_client():
     """Initialize Qdrant client"""
     global _client
 
@@ -47,17 +99,57 @@ def init_vector_client():
 
     logger.info(f"Connecting to Qdrant at {QDRANT_HOST}:{QDRANT_PORT}...")
 
-    _client = QdrantClient(
+    _client = AsyncQdrantClient(
         host=QDRANT_HOST,
         port=QDRANT_PORT,
         grpc_port=QDRANT_GRPC_PORT,
         prefer_grpc=True,
+        grpc_options=QDRANT_GRPC_OPTIONS,
     )
 
     # Test connection
-    collections = _client.get_collections()
+    collections = await _client.get_collections()
     logger.info(f"Qdrant connected - {len(collections.collections)} collections available")
 
+    if any(c.name == COLLECTION_TEXT for c in collections.collections):
+        await _ensure_text_collection()
+    else:
+        logger.warning(f"Collection {COLLECTION_TEXT} missing - run scripts/init-qdrant-collections.py")
+
+
+async def _ensure_text_collection():
+    """
+    Bring an existing text collection up to date: enable TEXT_QUANTIZATION
+    if it has none yet and create any missing TEXT_PAYLOAD_INDEXES
+    (existing settings and indexes are left alone)
+    """
+    info = await _client.get_collection(COLLECTION_TEXT)
+
+    if info.config.quantization_config is None:
+        await _client.update_collection(
+            collection_name=COLLECTION_TEXT,
+            quantization_config=TEXT_QUANTIZATION,
+        )
+        logger.info(f"Enabled int8 scalar quantization on {COLLECTION_TEXT}")
+
+    missing = {
+        field: schema
+        for field, schema in TEXT_PAYLOAD_INDEXES.items()
+        if field not in (info.payload_schema or {})
+    }
+    if not missing:
+        return
+
+    await asyncio.gather(*(
+        _client.create_payload_index(
+            collection_name=COLLECTION_TEXT,
+            field_name=field,
+            field_schema=schema,
+        )
+        for field, schema in missing.items()
+    ))
+    logger.info(f"Created payload indexes on {COLLECTION_TEXT}: {', '.join(missing)}")
+
 
 async def store_text_embedding(
     memory_id: UUID,
@@ -67,34 +159,85 @@ async def store_text_embedding(
     """
     Store text embedding in Qdrant (SBERT collection)
 
+    New memories don't come through here - write_batcher already coalesces
+    their vectors into store_text_embeddings_batch() upserts.
+
     Args:
         memory_id: UUID of the memory
         embedding: numpy array (384d)
         metadata: optional metadata (interface, emotion, importance, etc.)
     """
-    if _client is None:
-        raise RuntimeError("Qdrant client not initialized. Call init_vector_client() first.")
+    await store_text_embeddings_batch([(memory_id, embedding, metadata)])
 
-    # Convert UUID to string for Qdrant
-    point_id = str(memory_id)
 
-    # Convert numpy to list
-    vector = embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
+async def store_text_embeddings_batch(
+    points: List[Tuple[UUID, np.ndarray, Dict[str, Any]]],
+):
+    """
+    Store several text embeddings in a single upsert
 
-    # Create point
-    point = PointStruct(
-        id=point_id,
-        vector=vector,
-        payload=metadata or {},
-    )
+    Args:
+        points: (memory_id, embedding, metadata) tuples
+    """
+    if _client is None:
+        raise RuntimeError("Qdrant client not initialized. Call init_vector_client() first.")
 
-    # Upsert to collection
-    _client.upsert(
+    # One float32 -> list conversion for the whole batch; model_construct skips
+    # pydantic re-checking every float (the gRPC converter only reads the fields)
+    vectors = np.asarray([embedding for _, embedding, _ in points], dtype=np.float32).tolist()
+
+    await _client.upsert(
         collection_name=COLLECTION_TEXT,
-        points=[point],
+        points=[
+            PointStruct.model_construct(
+                id=str(memory_id),
+                vector=vector,
+                payload=metadata or {},
+            )
+            for (memory_id, _, metadata), vector in zip(points, vectors)
+        ],
+        wait=QDRANT_UPSERT_WAIT,
     )
 
-    logger.debug(f"Stored text embedding for memory {memory_id}")
+    logger.debug(f"Stored {len(points)} text embeddings")
+
+
+# Searches reuse a handful of filter combinations - build each Filter once.
+# The returned objects are shared, so callers must not modify them.
+@lru_cache(maxsize=256)
+def _build_filter(
+    interface: Optional[str] = None,
+    privacy_realm: Optional[str] = None,
+    min_importance: Optional[float] = None,
+) -> Optional[Filter]:
+    filter_conditions = [
+        FieldCondition(key=key, match=MatchValue(value=value))
+        for key, value in (("interface", interface), ("privacy_realm", privacy_realm))
+        if value
+    ]
+
+    if min_importance is not None:
+        filter_conditions.append(
+            FieldCondition(key="importance_to_me", range=Range(gte=min_importance))
+        )
+
+    return Filter(must=filter_conditions) if filter_conditions else None
+
+
+# Point IDs come back as strings. The same memories keep turning up in
+# searches, so parse each ID once (UUIDs are immutable, sharing is safe).
+_parse_point_id = lru_cache(maxsize=65536)(UUID)
+
+
+def _format_hits(points) -> List[Dict[str, Any]]:
+    return [
+        {
+            "memory_id": _parse_point_id(hit.id),
+            "score": hit.score,
+            "metadata": hit.payload or {},
+        }
+        for hit in points
+    ]
 
 
 async def search_text_embeddings(
@@ -103,110 +246,139 @@ async def search_text_embeddings(
     interface: Optional[str] = None,
     privacy_realm: Optional[str] = None,
     min_importance: Optional[float] = None,
+    with_payload: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Search for similar memories using text embedding
 
-    Returns list of results with memory_id, score, and metadata
+    Returns list of results with memory_id, score, and metadata. The payload
+    is only fetched when with_payload is set - the server reads full rows
+    from PostgreSQL, so by default metadata is empty.
     """
     if _client is None:
         raise RuntimeError("Qdrant client not initialized")
 
-    # Convert numpy to list
-    vector = query_embedding.tolist() if isinstance(query_embedding, np.ndarray) else query_embedding
+    # Search - query_points takes the ndarray as-is (no tolist() + pydantic
+    # validation of 384 floats per query)
+    response = await _client.query_points(
+        collection_name=COLLECTION_TEXT,
+        query=np.asarray(query_embedding, dtype=np.float32),
+        limit=limit,
+        query_filter=_build_filter(interface, privacy_realm, min_importance),
+        search_params=TEXT_SEARCH_PARAMS,
+        with_payload=with_payload,
+    )
 
-    # Build filter
-    filter_conditions = []
+    formatted = _format_hits(response.points)
 
-    if interface:
-        filter_conditions.append(
-            FieldCondition(key="interface", match=MatchValue(value=interface))
-        )
+    logger.info(f"Found {len(formatted)} similar memories")
 
-    if privacy_realm:
-        filter_conditions.append(
-            FieldCondition(key="privacy_realm", match=MatchValue(value=privacy_realm))
-        )
+    return formatted
 
-    if min_importance is not None:
-        filter_conditions.append(
-            FieldCondition(key="importance_to_me", range={"gte": min_importance})
-        )
 
-    search_filter = Filter(must=filter_conditions) if filter_conditions else None
+async def search_text_embeddings_batch(
+    query_embeddings: List[np.ndarray],
+    limit: int = 10,
+    interface: Optional[str] = None,
+    privacy_realm: Optional[str] = None,
+    min_importance: Optional[float] = None,
+    with_payload: bool = False,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Run several searches with the same filters in one Qdrant request
+
+    Returns one result list (same shape as search_text_embeddings) per query, in order
+    """
+    if _client is None:
+        raise RuntimeError("Qdrant client not initialized")
+
+    search_filter = _build_filter(interface, privacy_realm, min_importance)
 
-    # Search
-    results = _client.search(
+    responses = await _client.query_batch_points(
         collection_name=COLLECTION_TEXT,
-        query_vector=vector,
-        limit=limit,
-        query_filter=search_filter,
-        with_payload=True,
+        requests=[
+            QueryRequest(
+                query=np.asarray(embedding, dtype=np.float32).tolist(),
+                filter=search_filter,
+                params=TEXT_SEARCH_PARAMS,
+                limit=limit,
+                with_payload=with_payload,
+            )
+            for embedding in query_embeddings
+        ],
     )
 
-    # Format results
-    formatted = []
-    for hit in results:
-        formatted.append({
-            "memory_id": UUID(hit.id),
-            "score": hit.score,
-            "metadata": hit.payload,
-        })
+    formatted = [_format_hits(response.points) for response in responses]
 
-    logger.info(f"Found {len(formatted)} similar memories")
+    logger.info(f"Batch search: {len(formatted)} queries")
 
     return formatted
 
 
-async def delete_memory_vectors(memory_id: UUID):
-    """Delete all vectors for a memory from all collections"""
+async def delete_memories_vectors(memory_ids: List[Union[UUID, str]]):
+    """
+    Delete all vectors for several memories
+
+    One delete per collection, all collections concurrently. A failing
+    collection is logged and doesn't stop the others.
+    """
     if _client is None:
         raise RuntimeError("Qdrant client not initialized")
 
-    point_id = str(memory_id)
+    point_ids = [str(memory_id) for memory_id in memory_ids]
 
-    # Delete from text collection
-    try:
-        _client.delete(
-            collection_name=COLLECTION_TEXT,
-            points_selector=[point_id],
-        )
-        logger.debug(f"Deleted text embedding for memory {memory_id}")
-    except Exception as e:
-        logger.warning(f"Failed to delete from {COLLECTION_TEXT}: {e}")
+    results = await asyncio.gather(
+        *(
+            _client.delete(collection_name=collection_name, points_selector=point_ids)
+            for collection_name in MEMORY_VECTOR_COLLECTIONS
+        ),
+        return_exceptions=True,
+    )
 
-    # TODO: Delete from other collections when implemented
-    # _client.delete(collection_name=COLLECTION_JINA, points_selector=[point_id])
-    # _client.delete(collection_name=COLLECTION_AUDIO, points_selector=[point_id])
+    for collection_name, result in zip(MEMORY_VECTOR_COLLECTIONS, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Failed to delete from {collection_name}: {result}")
 
+    logger.debug(f"Deleted vectors for {len(point_ids)} memories")
 
-def get_collection_stats() -> Dict[str, Any]:
-    """Get statistics for all collections"""
+
+async def delete_memory_vectors(memory_id: Union[UUID, str]):
+    """Delete all vectors for a memory from all collections"""
+    await delete_memories_vectors([memory_id])
+
+
+async def get_collection_stats() -> Dict[str, Any]:
+    """Get statistics for all collections (fetched concurrently)"""
     if _client is None:
         raise RuntimeError("Qdrant client not initialized")
 
+    collection_names = [COLLECTION_TEXT, COLLECTION_JINA, COLLECTION_AUDIO, COLLECTION_UNIFIED]
+    infos = await asyncio.gather(
+        *(_client.get_collection(collection_name) for collection_name in collection_names),
+        return_exceptions=True,
+    )
+
     stats = {}
 
-    for collection_name in [COLLECTION_TEXT, COLLECTION_JINA, COLLECTION_AUDIO, COLLECTION_UNIFIED]:
-        try:
-            info = _client.get_collection(collection_name)
+    for collection_name, info in zip(collection_names, infos):
+        if isinstance(info, Exception):
+            stats[collection_name] = {"error": str(info)}
+        else:
             stats[collection_name] = {
                 "points_count": info.points_count,
                 "status": info.status,
                 "vectors_count": info.vectors_count,
             }
-        except Exception as e:
-            stats[collection_name] = {"error": str(e)}
 
     return stats
 
 
-def shutdown():
+async def shutdown():
     """Cleanup vector client"""
     global _client
 
     if _client is not None:
         logger.info("Closing Qdrant client...")
-        _client.close()
+        await _client.close()
         _client = None
         logger.info("Qdrant client closed")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Universal Memory V5 - Memory Write Batcher
+
+Groups concurrent create_memory requests so each burst costs one PostgreSQL
+transaction (executemany) and one Qdrant upsert instead of one of each per
+memory. A batch is flushed when it reaches MEMORY_BATCH_MAX_SIZE memories or
+MEMORY_BATCH_WINDOW_MS after its first memory arrived.
+
+Authors: Aurora & Steve
+Created: October 24, 2025
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import database_service
+from . import search_cache
+from . import vector_service
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+MEMORY_BATCH_MAX_SIZE = int(os.getenv("MEMORY_BATCH_MAX_SIZE", "32"))
+MEMORY_BATCH_WINDOW_MS = int(os.getenv("MEMORY_BATCH_WINDOW_MS", "10"))
+
+# (create_memory kwargs, text embedding or None, Qdrant metadata, result future)
+_Item = Tuple[Dict[str, Any], Optional[np.ndarray], Dict[str, Any], asyncio.Future]
+
+
+class MemoryWriteBatcher:
+    """Background task that writes queued memories in batches"""
+
+    def __init__(self, max_size: int = MEMORY_BATCH_MAX_SIZE, window_ms: int = MEMORY_BATCH_WINDOW_MS):
+        self.max_size = max_size
+        self.window = window_ms / 1000
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Task] = None
+        # Batch still being collected - kept here so stop() can flush it
+        self._batch: List[_Item] = []
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop accepting work after flushing everything already queued"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self._flushing is not None:
+            await self._flushing
+
+        # The batch _run was collecting when cancelled, plus anything
+        # submitted after it, still gets written
+        pending, self._batch = self._batch, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            await self._flush(pending)
+
+    async def submit(
+        self,
+        fields: Dict[str, Any],
+        embedding: Optional[np.ndarray],
+        metadata: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Queue one memory and wait for its batch to be written"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fields, embedding, metadata, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            self._batch = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.window
+
+            while len(self._batch) < self.max_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch, self._batch = self._batch, []
+
+            # Shield so stop() can't interrupt a half-written batch
+            self._flushing = asyncio.create_task(self._flush(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    async def _flush(self, batch: List[_Item]):
+        # memory_id and timestamp are generated client-side, so the Qdrant
+        # payload doesn't have to wait for the INSERT
+        records = []
+        valid = []
+        for item in batch:
+            try:
+                records.append(database_service.build_memory_record(**item[0]))
+            except Exception as e:
+                self._fail([item], e)
+            else:
+                valid.append(item)
+
+        if not valid:
+            return
+        batch = valid
+
+        points = [
+            (record["memory_id"], embedding, {**metadata, "timestamp": record["timestamp"].isoformat()})
+            for record, (_, embedding, metadata, _) in zip(records, batch)
+            if embedding is not None
+        ]
+
+        db_result, vector_result = await asyncio.gather(
+            database_service.create_memories(records),
+            vector_service.store_text_embeddings_batch(points) if points else asyncio.sleep(0),
+            return_exceptions=True,
+        )
+
+        if isinstance(vector_result, BaseException):
+            self._fail(batch, db_result if isinstance(db_result, BaseException) else vector_result)
+            return
+
+        if not isinstance(db_result, BaseException):
+            results = db_result
+        elif len(records) == 1:
+            results = [db_result]
+        else:
+            # One row PostgreSQL rejects rolls back the whole transaction -
+            # retry one at a time so only that memory's caller gets the error
+            logger.warning(f"Batch insert of {len(records)} memories failed ({db_result}) - retrying one by one")
+            results = await self._create_one_by_one(records)
+
+        # Vectors without rows would surface as phantom search hits
+        orphaned = [
+            record["memory_id"]
+            for record, result, (_, embedding, _, _) in zip(records, results, batch)
+            if isinstance(result, BaseException) and embedding is not None
+        ]
+        if orphaned:
+            await vector_service.delete_memories_vectors(orphaned)
+
+        written = 0
+        for result, item in zip(results, batch):
+            if isinstance(result, BaseException):
+                self._fail([item], result)
+            else:
+                written += 1
+                if not item[3].done():
+                    item[3].set_result(result)
+
+        # New memories can change any search's hits
+        if written:
+            search_cache.invalidate()
+
+        logger.debug(f"Wrote batch of {written}/{len(batch)} memories")
+
+    @staticmethod
+    async def _create_one_by_one(records: List[Dict[str, Any]]) -> List[Any]:
+        """Each record in its own transaction - the created memory or the exception, per record"""
+        results = []
+        for record in records:
+            try:
+                results.append((await database_service.create_memories([record]))[0])
+            except Exception as e:
+                results.append(e)
+        return results
+
+    @staticmethod
+    def _fail(batch: List[_Item], error: BaseException):
+        logger.error(f"Failed to write {len(batch)} memories: {error}")
+        for _, _, _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+
+# Global batcher
+_batcher: Optional[MemoryWriteBatcher] = None
+
+
+def init_batcher():
+    """Start the background memory writer"""
+    global _batcher
+
+    if _batcher is not None:
+        logger.warning("Memory write batcher already running")
+        return
+
+    _batcher = MemoryWriteBatcher()
+    _batcher.start()
+    logger.info(f"Memory write batcher started (max={MEMORY_BATCH_MAX_SIZE}, window={MEMORY_BATCH_WINDOW_MS}ms)")
+
+
+async def submit(
+    fields: Dict[str, Any],
+    embedding: Optional[np.ndarray],
+    metadata: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Create a memory through the batcher
+
+    Args:
+        fields: keyword arguments for database_service.create_memory
+        embedding: SBERT text embedding, or None to skip Qdrant
+        metadata: Qdrant payload (timestamp is added once the row exists)
+
+    Returns the created memory, same shape as database_service.create_memory
+    """
+    if _batcher is None:
+        raise RuntimeError("Memory write batcher not running. Call init_batcher() first.")
+
+    return await _batcher.submit(fields, embedding, metadata)
+
+
+async def shutdown():
+    """Flush pending writes and stop the batcher"""
+    global _batcher
+
+    if _batcher is not None:
+        logger.info("Stopping memory write batcher...")
+        await _batcher.stop()
+        _batcher = None
+        logger.info("Memory write batcher stopped")
@@ -7,7 +7,7 @@ This tests the complete pipeline: embedding generation -> vector search -> resul
 """
 
 import httpx
-import json
+import orjson
 
 # Test queries to search for
 test_queries = [
@@ -23,23 +23,25 @@ print("TESTING MEMORY V5 SEMANTIC SEARCH")
 print("=" * 60)
 print()
 
-for query in test_queries:
-    print(f"Query: '{query}'")
-    print("-" * 60)
-
-    try:
-        response = httpx.post(
-            "http://localhost:8004/api/v5/search",
-            json={
-                "query": query,
+# All queries in one request - one Qdrant batch search and one PostgreSQL read
+try:
+    with httpx.Client(base_url="http://localhost:8004", timeout=30.0) as client:
+        response = client.post(
+            "/api/v5/search_batch",
+            content=orjson.dumps({
+                "queries": test_queries,
                 "limit": 3,
                 "interface": "vscode"  # Optional filter
-            },
-            timeout=30.0,
+            }),
+            headers={"content-type": "application/json"},
         )
 
-        if response.status_code == 200:
-            results = response.json()
+    if response.status_code == 200:
+        searches = orjson.loads(response.content)["searches"]
+
+        for query, results in zip(test_queries, searches):
+            print(f"Query: '{query}'")
+            print("-" * 60)
             print(f"Found {len(results.get('results', []))} results:")
 
             for i, result in enumerate(results.get('results', []), 1):
@@ -47,13 +49,15 @@ for query in test_queries:
                 print(f"     Score: {result['score']:.4f}")
                 print(f"     What: {result['what_happened'][:80]}...")
                 print(f"     Emotion: {result['emotion_primary']} ({result['emotion_intensity']})")
-        else:
-            print(f"ERROR: {response.status_code}")
-            print(response.text)
 
-    except Exception as e:
-        print(f"ERROR: {e}")
+            print()
+    else:
+        print(f"ERROR: {response.status_code}")
+        print(response.text)
+        print()
 
+except Exception as e:
+    print(f"ERROR: {e}")
     print()
 
 print("=" * 60)